@@ -1,5 +1,6 @@
 import maya.cmds as cmds
 import random
+import numbers
 
 def UI():
 	'''creates a UI for speaker system, containing a loading bar, followed by checkboxes
@@ -92,10 +93,6 @@ def main(windowName, filePath, curveOn, lightOn, barsOn, sameCol, smoothCol, par
 	#if a file path is given
 	if filePath:
 		
-		#empty list used for grouping everything at end
-		componentList = []
-		colorItemList = []
-		
 		#calculate progress bar size needed
 		maxProgress = curveOn + lightOn + 100 * barsOn + sameCol + bool(particleStr) + 3
 		#change max value of progress bar
@@ -107,78 +104,14 @@ def main(windowName, filePath, curveOn, lightOn, barsOn, sameCol, smoothCol, par
 		#delete all objects in scene
 		cmds.select(all=True)
 		cmds.delete()
-		#find name of audio file used
-		fileName = findFileName(filePath)
-		#import sound and get length
-		audioNode = importSound(filePath)
-		if(audioNode):
-			audioLength = int(cmds.getAttr(fileName + ".duration"))
-			
-			######increment progress bar######
-			cmds.progressBar(progressName, edit=True, step=1)
+		#import sound, get length and create list of amplitude at each frame
+		analysis = analyseSound(filePath, progressName)
+		if(analysis):
+			audioNode, audioLength, ampList = analysis
 			
-			#create list of amplitude at each frame
-			ampList = createAverageAmpList(audioNode, audioLength)
+			#build the speaker system and its components on the analysed envelope
+			createSpeakerSystem(audioNode, audioLength, ampList, curveOn, lightOn, barsOn, sameCol, smoothCol, particleStr, particleThres, colorThres, progressName)
 			
-			#create speaker
-			speakerShapeGroup, position = createSpeakerGroup(ampList, audioLength)
-			
-			######increment progress bar######
-			cmds.progressBar(progressName, edit=True, step=1)
-			
-			componentList.append(speakerShapeGroup)
-			
-			#sound curve
-			if curveOn:
-				curve = createCurve(position, ampList, audioLength)
-				######increment progress bar######
-				cmds.progressBar(progressName, edit=True, step=1)
-				
-				componentList.append(curve)
-			
-			#speaker light
-			if lightOn:
-				speakerLight = createLight(position, ampList, audioLength)
-				if sameCol == False:
-					randomiseColor([speakerLight], ampList, audioLength, smoothCol, colorThres)
-				else:
-					colorItemList.append(speakerLight)
-				######increment progress bar######
-				cmds.progressBar(progressName, edit=True, step=1)
-				
-				componentList.append(speakerLight)
-			
-			#particles
-			if particleStr:
-				particleEmitter, particles, particleShader = createParticles(position, ampList, audioLength, particleStr, particleThres)
-				colorItemList.append(particleShader)
-				if sameCol == False:
-					randomiseColor([particleShader], ampList, audioLength, smoothCol, colorThres)
-				else:
-					colorItemList.append(particleShader)
-				######increment progress bar######
-				cmds.progressBar(progressName, edit=True, step=1)
-				
-				componentList.append(particleEmitter)
-				componentList.append(particles)
-			
-			#randomise itemList colours
-			if sameCol == True:
-				randomiseColor(colorItemList, ampList, audioLength, smoothCol, colorThres)
-				######increment progress bar######
-				cmds.progressBar(progressName, edit=True, step=1)
-			
-			#audio bars
-			if barsOn:
-				barGroup = createBars(audioNode, audioLength, 10, 10, progressName)
-				#if lights are on, create one to illuminate the bars
-				if lightOn:
-					barLight = cmds.duplicate(speakerLight, un=True)
-					cmds.move(0,47,0, barLight, r=True)
-					componentList.append(barLight[0])
-				componentList.append(barGroup)
-			
-			cmds.group(componentList, name="speakerSystem")
 			#set playback to length of audio
 			cmds.playbackOptions(min=1, max=audioLength)
 			
@@ -190,6 +123,119 @@ def main(windowName, filePath, curveOn, lightOn, barsOn, sameCol, smoothCol, par
 	else:
 		cmds.confirmDialog(title="No File Found!",button="ok", message="Please specify a file!")
 
+def createSpeakerSystem(audioNode, audioLength, ampList, curveOn, lightOn, barsOn, sameCol, smoothCol, particleStr, particleThres, colorThres, progressName=None):
+	'''builds the speaker and the requested components from an already analysed list of amplitudes, so the
+	audio only has to be imported and read once.
+	
+	audioNode     : the audio node the amplitudes were read from, used by the bars
+	audioLength   : length of the audio, in frames
+	ampList       : list of amplitudes, as returned by createAverageAmpList
+	progressName  : name of the progress bar to update, or None for no progress bar
+	
+	the remaining arguments are the same as in main.
+	
+	return        : the group containing the speaker system
+	'''
+	#empty list used for grouping everything at end
+	componentList = []
+	colorItemList = []
+	
+	#create speaker
+	speakerShapeGroup, position = createSpeakerGroup(ampList, audioLength)
+	
+	######increment progress bar######
+	stepProgress(progressName)
+	
+	componentList.append(speakerShapeGroup)
+	
+	#sound curve
+	if curveOn:
+		curve = createCurve(position, ampList, audioLength)
+		######increment progress bar######
+		stepProgress(progressName)
+		
+		componentList.append(curve)
+	
+	#speaker light
+	if lightOn:
+		speakerLight = createLight(position, ampList, audioLength)
+		if sameCol == False:
+			randomiseColor([speakerLight], ampList, audioLength, smoothCol, colorThres)
+		else:
+			colorItemList.append(speakerLight)
+		######increment progress bar######
+		stepProgress(progressName)
+		
+		componentList.append(speakerLight)
+	
+	#particles
+	if particleStr:
+		particleEmitter, particles, particleShader = createParticles(position, ampList, audioLength, particleStr, particleThres)
+		colorItemList.append(particleShader)
+		if sameCol == False:
+			randomiseColor([particleShader], ampList, audioLength, smoothCol, colorThres)
+		else:
+			colorItemList.append(particleShader)
+		######increment progress bar######
+		stepProgress(progressName)
+		
+		componentList.append(particleEmitter)
+		componentList.append(particles)
+	
+	#randomise itemList colours
+	if sameCol == True:
+		randomiseColor(colorItemList, ampList, audioLength, smoothCol, colorThres)
+		######increment progress bar######
+		stepProgress(progressName)
+	
+	#audio bars
+	if barsOn:
+		barGroup = createBars(audioNode, audioLength, 10, 10, progressName)
+		#if lights are on, create one to illuminate the bars
+		if lightOn:
+			barLight = cmds.duplicate(speakerLight, un=True)
+			cmds.move(0,47,0, barLight, r=True)
+			componentList.append(barLight[0])
+		componentList.append(barGroup)
+	
+	return cmds.group(componentList, name="speakerSystem")
+
+def stepProgress(progressName):
+	'''increments the given progress bar by one step, doing nothing if no progress bar is given.
+	
+	progressName : name of the progress bar to update, or None
+	'''
+	if progressName:
+		cmds.progressBar(progressName, edit=True, step=1)
+
+def analyseSound(filePath, progressName=None, ampList=None):
+	'''imports the audio file and reads the amplitude of each frame, ready to drive the speaker system.
+	
+	filePath     : the location of the audio file to be used
+	progressName : name of the progress bar to update, or None for no progress bar
+	ampList      : amplitudes already read from this file, so the audio doesn't have to be read again, or None
+	
+	return       : the audio node, the length of the audio in frames and the list of amplitudes,
+	               or None if the file can't be imported
+	'''
+	#find name of audio file used
+	fileName = findFileName(filePath)
+	#import sound and get length
+	audioNode = importSound(filePath)
+	if not audioNode:
+		return None
+	audioLength = int(cmds.getAttr(fileName + ".duration"))
+	
+	######increment progress bar######
+	stepProgress(progressName)
+	
+	if ampList is None:
+		#create list of amplitude at each frame
+		ampList = createAverageAmpList(audioNode, audioLength)
+	elif len(ampList) != audioLength:
+		raise ValueError("ampList has %d frames but %s has %d, it must come from the same file" % (len(ampList), filePath, audioLength))
+	return audioNode, audioLength, ampList
+
 def findFileName(filePath):
 	'''the name of the audio file is required for the program to work. however it is difficult to acquire this
 	as it is returned by a MEL command called in the importing of the audio node. so i created a function to
@@ -390,7 +436,7 @@ def createBars(audioNode, audioLength, numOfBarsX, numOfBarsZ, progressName):
 			#once the bar is keyframed, add it to the list
 			barList.append(bar[0])
 			######increment progress bar######
-			cmds.progressBar(progressName, edit=True, step=1)
+			stepProgress(progressName)
 	
 	#group the created bars
 	barGroup = cmds.group(barList, name='barGroup')
@@ -518,5 +564,236 @@ def randomiseColor(itemList, ampList, audioLength, smoothCol, threshold):
 					cmds.setAttr(item+".color", red, green, blue, type="double3")
 					cmds.setKeyframe(item, attribute="color", time=i, inTangentType="linear", outTangentType="flat")
 
+def sweepParameters(ampList, particleStrList, particleThresList, colorThresList, smoothColList=(True,), lightOn=True, barsOn=False, numOfBins=10):
+	'''evaluates every combination of the given particle strengths, particle thresholds, colour thresholds and
+	smooth colour options against a single list of amplitudes. nothing is created in the scene, the statistics
+	are found with numpy broadcasts so a large grid costs little more than a single setting.
+	
+	every statistic is an array with one axis per parameter list, in the order
+	(particleStr, particleThres, colorThres, smoothCol), so sweep["emittingFrames"][i,j,k,l] is the result of
+	using particleStrList[i], particleThresList[j], colorThresList[k] and smoothColList[l].
+	
+	ampList           : list of amplitudes, as returned by createAverageAmpList
+	particleStrList   : particle strengths to try, a single value is treated as a list of one
+	particleThresList : particle emission thresholds to try, a single value is treated as a list of one
+	colorThresList    : colour change thresholds to try, a single value is treated as a list of one
+	smoothColList     : smooth colour options to try, a single value is treated as a list of one
+	lightOn           : whether a light will be coloured alongside the particles, used for the key counts
+	barsOn            : whether bars will be built, which adds a copy of the light with its own colour keys
+	numOfBins         : number of bins in the emission rate histograms
+	
+	return            : dictionary of parameter grids and statistics, containing
+	                    particleStr, particleThres, colorThres, smoothCol : the parameters of each configuration
+	                    emittingFrames : number of frames where particles are emitted
+	                    colorChanges   : number of frames where the colour changes
+	                    emitHistogram  : emission rate histogram of the emitting frames, with numOfBins as the last axis
+	                    emitBinEdges   : edges of the histogram bins, shared by every configuration
+	                    ampList        : the amplitudes the sweep was evaluated against, to pass back to lookdevSweep
+	                    keyCount       : number of keyframes the configuration sets on the emitter and coloured items,
+	                                     counting the light copied for the bars. the scale keys on the speaker and
+	                                     bars are not counted, as they are the same for every configuration
+	'''
+	#numpy is only needed for the sweep, so importing it here keeps the rest of the tool working without it
+	import numpy as np
+	
+	#single values are treated as a list of one setting
+	amps = toSweepArray(ampList, "ampList")
+	strengths, particleThresholds, colorThresholds, smooth = checkSweepArguments(particleStrList, particleThresList, colorThresList, smoothColList, numOfBins)
+	audioLength = len(amps)
+	gridShape = (len(strengths), len(particleThresholds), len(colorThresholds), len(smooth))
+	
+	#only a particle strength of 0 turns the particles off, matching the truth test in createSpeakerSystem
+	particlesOn = strengths != 0
+	
+	#frames emitting for each (strength, threshold), matching the test in setParticleEmission
+	emitMask = (amps[np.newaxis, :] >= particleThresholds[:, np.newaxis]) & particlesOn[:, np.newaxis, np.newaxis]
+	emittingFrames = emitMask.sum(axis=-1)
+	
+	#frames changing colour for each threshold, matching the test in randomiseColor
+	changeMask = amps[np.newaxis, :] > colorThresholds[:, np.newaxis]
+	colorChanges = changeMask.sum(axis=-1)
+	#a sudden change also keys the frame before, which is already keyed when that frame changes too,
+	#so each run of changing frames only adds one extra keyed frame, at its start
+	previousChanging = np.zeros_like(changeMask)
+	previousChanging[:, 1:] = changeMask[:, :-1]
+	runStarts = (changeMask & ~previousChanging).sum(axis=-1)
+	
+	#emission rate of every frame for each (strength, threshold), using the same formula as setParticleEmission
+	emitRates = (30 * amps[np.newaxis, :] * strengths[:, np.newaxis])**2
+	emitRates = np.where(emitMask, emitRates[:, np.newaxis, :], 0.0)
+	
+	#share the bin edges across every configuration so the histograms can be compared directly
+	maxRate = emitRates.max() if emitRates.size else 0.0
+	emitBinEdges = np.linspace(0.0, maxRate if maxRate > 0 else 1.0, numOfBins + 1)
+	binIndex = np.clip(np.searchsorted(emitBinEdges, emitRates, side="right") - 1, 0, numOfBins - 1)
+	#offset each configuration's bins so a single bincount fills every histogram at once
+	configIndex = np.arange(emitMask.shape[0] * emitMask.shape[1]).reshape(emitMask.shape[:2])
+	flatIndex = configIndex[:, :, np.newaxis] * numOfBins + binIndex
+	emitHistogram = np.bincount(flatIndex[emitMask], minlength=configIndex.size * numOfBins)
+	emitHistogram = emitHistogram.reshape(emitMask.shape[:2] + (numOfBins,))
+	
+	#the emitter keys speed and rate on every frame, and each coloured item is keyed on every changing frame
+	#when smooth, or on every changing frame and the frame before when the change is sudden. the light is
+	#duplicated with its keys for the bars, so it counts twice when bars are on
+	emitterKeys = 2 * audioLength * particlesOn
+	colorItems = int(bool(lightOn)) * (1 + int(bool(barsOn))) + particlesOn
+	colorKeyedFrames = np.where(smooth[np.newaxis, :], colorChanges[:, np.newaxis], (colorChanges + runStarts)[:, np.newaxis])
+	keyCount = (emitterKeys[:, np.newaxis, np.newaxis, np.newaxis]
+	            + colorItems[:, np.newaxis, np.newaxis, np.newaxis]
+	            * colorKeyedFrames[np.newaxis, np.newaxis, :, :])
+	
+	#parameter grids, so any configuration can be read back from its index
+	particleStrGrid, particleThresGrid, colorThresGrid, smoothColGrid = np.meshgrid(strengths, particleThresholds, colorThresholds, smooth, indexing="ij")
+	
+	return {"ampList"        : amps.tolist(),
+	        "particleStr"    : particleStrGrid,
+	        "particleThres"  : particleThresGrid,
+	        "colorThres"     : colorThresGrid,
+	        "smoothCol"      : smoothColGrid,
+	        "emittingFrames" : np.broadcast_to(emittingFrames[:, :, np.newaxis, np.newaxis], gridShape).copy(),
+	        "colorChanges"   : np.broadcast_to(colorChanges[np.newaxis, np.newaxis, :, np.newaxis], gridShape).copy(),
+	        "emitHistogram"  : np.broadcast_to(emitHistogram[:, :, np.newaxis, np.newaxis, :], gridShape + (numOfBins,)).copy(),
+	        "emitBinEdges"   : emitBinEdges,
+	        "keyCount"       : np.broadcast_to(keyCount, gridShape).copy()}
+
+def lookdevSweep(filePath, particleStrList, particleThresList, colorThresList, smoothColList=(True,), applyIndex=None,
+                 curveOn=False, lightOn=True, barsOn=False, sameCol=True, numOfBins=10, ampList=None):
+	'''imports and analyses the audio once, then compares every combination of the given settings with
+	sweepParameters. optionally builds the speaker system using one chosen configuration, reusing the
+	analysed amplitudes rather than reading the audio again. the scene is only cleared when a configuration
+	is built. when only comparing, the imported audio is removed again so the scene is left as it was.
+	
+	the amplitudes are returned in the sweep, so a configuration picked from a compare-only call can be built
+	without reading the audio again:
+	    sweep = lookdevSweep(filePath, [3, 7, 11], [0.3, 0.4], [0.2, 0.3])
+	    lookdevSweep(filePath, [3, 7, 11], [0.3, 0.4], [0.2, 0.3], applyIndex=(1, 0, 1, 0), ampList=sweep["ampList"])
+	
+	filePath          : the location of the audio file to be used
+	particleStrList   : particle strengths to try
+	particleThresList : particle emission thresholds to try
+	colorThresList    : colour change thresholds to try
+	smoothColList     : smooth colour options to try
+	applyIndex        : index into the sweep grid of the configuration to build, as a tuple of 4 indices in the
+	                    order (particleStr, particleThres, colorThres, smoothCol), or None to only compare
+	curveOn           : boolean specifying whether the applied configuration has a curve
+	lightOn           : boolean specifying whether the applied configuration has lights, also used for the key counts
+	barsOn            : boolean specifying whether the applied configuration has bars, also used for the key counts
+	sameCol           : boolean specifying whether the particles and the light should be the same colours
+	numOfBins         : number of bins in the emission rate histograms
+	ampList           : amplitudes from an earlier sweep of the same file, or None to read them from the audio
+	
+	return            : the dictionary returned by sweepParameters, or None if the file can't be imported
+	'''
+	#check the settings and the chosen configuration before anything in the scene is changed
+	checkSweepArguments(particleStrList, particleThresList, colorThresList, smoothColList, numOfBins)
+	if ampList is not None:
+		toSweepArray(ampList, "ampList")
+	if applyIndex is not None:
+		applyIndex = checkApplyIndex(applyIndex, (particleStrList, particleThresList, colorThresList, smoothColList))
+		#the chosen configuration replaces the scene, as it does in main
+		cmds.select(all=True)
+		cmds.delete()
+		#import the audio for the build, only reading it if no amplitudes were given
+		analysis = analyseSound(filePath, ampList=ampList)
+		if not analysis:
+			return None
+		audioNode, audioLength, ampList = analysis
+	elif ampList is None:
+		#only comparing, so remember what is in the scene to leave it as it was found
+		existingNodes = set(cmds.ls(long=True))
+		#read the audio once
+		analysis = analyseSound(filePath)
+		#remove the nodes created by importing the audio
+		createdNodes = [node for node in cmds.ls(long=True) if node not in existingNodes]
+		if createdNodes:
+			cmds.delete(createdNodes)
+		if not analysis:
+			return None
+		ampList = analysis[2]
+	
+	#evaluate every configuration against the analysed audio
+	sweep = sweepParameters(ampList, particleStrList, particleThresList, colorThresList, smoothColList, lightOn, barsOn, numOfBins)
+	
+	if applyIndex is not None:
+		createSpeakerSystem(audioNode, audioLength, ampList, curveOn, lightOn, barsOn, sameCol,
+		                    bool(sweep["smoothCol"][applyIndex]),
+		                    float(sweep["particleStr"][applyIndex]),
+		                    float(sweep["particleThres"][applyIndex]),
+		                    float(sweep["colorThres"][applyIndex]))
+		#set playback to length of audio
+		cmds.playbackOptions(min=1, max=audioLength)
+	return sweep
+
+def checkSweepArguments(particleStrList, particleThresList, colorThresList, smoothColList, numOfBins):
+	'''checks the settings given to a sweep, raising a clear error naming the first argument that can't be used.
+	
+	numOfBins : number of bins in the emission rate histograms
+	
+	the remaining arguments are the same as in sweepParameters.
+	
+	return    : the four parameter lists as 1d numpy arrays
+	'''
+	if isinstance(numOfBins, bool) or not isinstance(numOfBins, numbers.Integral) or numOfBins < 1:
+		raise ValueError("numOfBins must be a whole number of at least 1, got %r" % (numOfBins,))
+	return (toSweepArray(particleStrList, "particleStrList"),
+	        toSweepArray(particleThresList, "particleThresList"),
+	        toSweepArray(colorThresList, "colorThresList"),
+	        toSweepArray(smoothColList, "smoothColList", bool))
+
+def toSweepArray(values, argumentName, dtype=float):
+	'''converts a single value or a flat list into a 1d numpy array, raising a ValueError naming the argument
+	if it is nested or contains the wrong type of value.
+	
+	values       : the value or list to convert
+	argumentName : name of the argument, used in the error message
+	dtype        : float for numbers, or bool for on and off options
+	
+	return       : the values as a 1d numpy array
+	'''
+	import numpy as np
+	
+	message = "%s must be a single value or a flat list of %s, got %r" % (argumentName, "booleans" if dtype is bool else "numbers", values)
+	try:
+		array = np.asarray(values)
+	#ragged lists can't be made into an array
+	except ValueError:
+		raise ValueError(message)
+	if array.ndim > 1:
+		raise ValueError(message)
+	if array.size:
+		if dtype is bool:
+			#numpy turns any non-empty string into True, so only accept booleans and 0 or 1
+			if array.dtype.kind not in "biu" or not ((array == 0) | (array == 1)).all():
+				raise ValueError(message)
+		elif array.dtype.kind not in "biuf":
+			raise ValueError(message)
+	return np.atleast_1d(array.astype(dtype))
+
+def checkApplyIndex(applyIndex, parameterLists):
+	'''checks that an index picks out a single configuration of a sweep, raising a clear error if it doesn't.
+	
+	applyIndex     : the index to check
+	parameterLists : the four parameter lists given to the sweep, in the order of the sweep axes
+	
+	return         : the index as a tuple
+	'''
+	import numpy as np
+	
+	axisNames = ("particleStr", "particleThres", "colorThres", "smoothCol")
+	message = "applyIndex must be a tuple of 4 indices (particleStr, particleThres, colorThres, smoothCol), got %r" % (applyIndex,)
+	try:
+		applyIndex = tuple(applyIndex)
+	except TypeError:
+		raise ValueError(message)
+	if len(applyIndex) != 4:
+		raise ValueError(message)
+	for index, parameterList, axisName in zip(applyIndex, parameterLists, axisNames):
+		if isinstance(index, bool) or not isinstance(index, numbers.Integral):
+			raise ValueError(message)
+		size = np.atleast_1d(parameterList).size
+		if not -size <= index < size:
+			raise IndexError("applyIndex %d is out of range for the %d %s settings" % (index, size, axisName))
+	return applyIndex
+
 if __name__ == "__main__":
 	UI()
@@ -0,0 +1,208 @@
+'''tests for the lookdev sweep in felix. maya.cmds is replaced with a stub that records every keyframe, so the
+statistics from sweepParameters are checked against the keys the real building functions set, outside of maya.
+'''
+import itertools
+import os
+import random
+import sys
+import types
+import unittest
+
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+#felix imports maya.cmds when it loads, so give it a placeholder outside of maya. each test swaps in its own stub
+try:
+	import maya.cmds
+except ImportError:
+	mayaModule = types.ModuleType("maya")
+	mayaModule.cmds = types.ModuleType("maya.cmds")
+	sys.modules["maya"] = mayaModule
+	sys.modules["maya.cmds"] = mayaModule.cmds
+
+import felix
+
+class FakeCmds(object):
+	'''stands in for maya.cmds, recording the keyframes set on each item and giving each created node a new name.
+
+	audioLength : number of frames reported as the duration of imported audio
+	'''
+	def __init__(self, audioLength=0):
+		self.audioLength = audioLength
+		#keys[item][attribute][time] = value
+		self.keys = {}
+		self.nodes = []
+		self.nodeCount = 0
+		self.outputReads = 0
+
+	def newNode(self, prefix="node"):
+		self.nodeCount += 1
+		name = "%s%d" % (prefix, self.nodeCount)
+		self.nodes.append(name)
+		return name
+
+	def itemName(self, item):
+		#maya commands accept the list returned by a creation command as well as a name
+		if isinstance(item, (list, tuple)):
+			return item[0]
+		return item
+
+	def setKeyframe(self, item, attribute, time, value=None, **kwargs):
+		attributeKeys = self.keys.setdefault(self.itemName(item), {}).setdefault(attribute, {})
+		attributeKeys[time] = value
+
+	def duplicate(self, item, un=False):
+		#duplicating with upstream nodes gives the copy its own animation curves
+		copy = self.newNode("duplicate")
+		source = self.keys.get(self.itemName(item), {})
+		self.keys[copy] = dict((attribute, dict(times)) for attribute, times in source.items())
+		return [copy]
+
+	def polyCube(self, **kwargs):
+		return [self.newNode("pCube"), self.newNode("polyCube")]
+
+	def polyCylinder(self, **kwargs):
+		return [self.newNode("pCylinder"), self.newNode("polyCylinder")]
+
+	def particle(self, **kwargs):
+		return [self.newNode("particle"), self.newNode("particleShape")]
+
+	def emitter(self, **kwargs):
+		return [self.newNode("emitter")]
+
+	def xform(self, *args, **kwargs):
+		if kwargs.get("q"):
+			return [0.0, 0.0, 0.0]
+
+	def getAttr(self, attribute, time=None):
+		if attribute.endswith(".duration"):
+			return self.audioLength
+		self.outputReads += 1
+		return random.random()
+
+	def ls(self, long=False):
+		return list(self.nodes)
+
+	def delete(self, items=None):
+		#with no arguments, delete the selection, which the tool only does after selecting everything
+		if items is None:
+			items = list(self.nodes)
+		for item in items:
+			if item in self.nodes:
+				self.nodes.remove(item)
+
+	def file(self, filePath, i=False):
+		self.nodes.append(felix.findFileName(filePath))
+
+	def createNode(self, nodeType):
+		return self.newNode(nodeType)
+
+	def __getattr__(self, name):
+		#every other command just creates a node, or does nothing worth recording
+		return lambda *args, **kwargs: self.newNode(name)
+
+	def countKeys(self, attributes):
+		'''the number of distinct keyed frames on the given attributes, across every item.
+		'''
+		return sum(len(itemKeys.get(attribute, {})) for itemKeys in self.keys.values() for attribute in attributes)
+
+@unittest.skipIf(np is None, "numpy is needed for the sweep")
+class SweepParametersTest(unittest.TestCase):
+
+	def setUp(self):
+		self.realCmds = felix.cmds
+		random.seed(0)
+
+	def tearDown(self):
+		felix.cmds = self.realCmds
+
+	def buildAndRecord(self, ampList, particleStr, particleThres, colorThres, smoothCol, lightOn, barsOn, sameCol):
+		'''builds the speaker system with the real felix functions under a fresh stub and returns the stub.
+		'''
+		fakeCmds = FakeCmds(len(ampList))
+		felix.cmds = fakeCmds
+		felix.createSpeakerSystem("audioWave", len(ampList), ampList, False, lightOn, barsOn, sameCol,
+		                          smoothCol, particleStr, particleThres, colorThres)
+		return fakeCmds
+
+	def checkAgainstBuild(self, ampList, particleStrList, particleThresList, colorThresList, smoothColList, lightOn, barsOn, sameCol):
+		sweep = felix.sweepParameters(ampList, particleStrList, particleThresList, colorThresList, smoothColList, lightOn, barsOn)
+		for index in np.ndindex(*sweep["keyCount"].shape):
+			particleStr = float(sweep["particleStr"][index])
+			fakeCmds = self.buildAndRecord(ampList, particleStr, float(sweep["particleThres"][index]),
+			                               float(sweep["colorThres"][index]), bool(sweep["smoothCol"][index]),
+			                               lightOn, barsOn, sameCol)
+			emitRates = [rate for itemKeys in fakeCmds.keys.values() for rate in itemKeys.get("rate", {}).values() if rate]
+			configuration = (index, lightOn, barsOn, sameCol)
+
+			self.assertEqual(sweep["emittingFrames"][index], len(emitRates), configuration)
+			self.assertEqual(list(sweep["emitHistogram"][index]), list(np.histogram(emitRates, bins=sweep["emitBinEdges"])[0]), configuration)
+			self.assertEqual(sweep["keyCount"][index], fakeCmds.countKeys(("speed", "rate", "color")), configuration)
+
+	def test_matchesBuiltKeys(self):
+		ampList = [random.uniform(0.01, 0.75) for i in range(12)]
+		for lightOn, barsOn, sameCol in itertools.product((True, False), repeat=3):
+			self.checkAgainstBuild(ampList, [0, 0.5, 2.5, -3, 7], [0.0, 0.4, 0.9], [0.1, 0.3, 0.8], [True, False], lightOn, barsOn, sameCol)
+
+	def test_backToBackColourChanges(self):
+		#adjacent changes in sudden mode share the key on the frame before
+		ampList = [0.1, 0.5, 0.6, 0.3, 0.7, 0.05]
+		sweep = felix.sweepParameters(ampList, 7, 0.0, 0.2, [True, False])
+		self.assertEqual(list(sweep["keyCount"].ravel()), [20, 22])
+		self.checkAgainstBuild(ampList, 7, 0.0, 0.2, [True, False], True, False, True)
+
+	def test_singleValues(self):
+		sweep = felix.sweepParameters([0.3, 0.5], 7, 0.4, 0.2)
+		self.assertEqual(sweep["keyCount"].shape, (1, 1, 1, 1))
+
+	def test_badArguments(self):
+		badArguments = [{"numOfBins" : 0},
+		                {"particleStrList" : [[1, 2], [3, 4]]},
+		                {"particleThresList" : ["0.4"]},
+		                {"smoothColList" : ["False"]}]
+		for badArgument in badArguments:
+			arguments = {"ampList" : [0.3, 0.5], "particleStrList" : [7], "particleThresList" : [0.4], "colorThresList" : [0.2]}
+			arguments.update(badArgument)
+			self.assertRaises(ValueError, felix.sweepParameters, **arguments)
+
+	def test_badApplyIndex(self):
+		parameterLists = ([3, 7], [0.4], [0.2], [True])
+		for applyIndex in (1, (0, 0), (0, 0, 0, 0.5)):
+			self.assertRaises(ValueError, felix.checkApplyIndex, applyIndex, parameterLists)
+		self.assertRaises(IndexError, felix.checkApplyIndex, (2, 0, 0, 0), parameterLists)
+
+@unittest.skipIf(np is None, "numpy is needed for the sweep")
+class LookdevSweepTest(unittest.TestCase):
+
+	def setUp(self):
+		self.realCmds = felix.cmds
+		self.fakeCmds = FakeCmds(8)
+		felix.cmds = self.fakeCmds
+		random.seed(0)
+
+	def tearDown(self):
+		felix.cmds = self.realCmds
+
+	def test_compareLeavesScene(self):
+		self.fakeCmds.nodes.append("userLookdevLight")
+		sweep = felix.lookdevSweep("/audio/track.wav", [3, 7], [0.4], [0.2])
+		self.assertEqual(self.fakeCmds.nodes, ["userLookdevLight"])
+		self.assertEqual(len(sweep["ampList"]), 8)
+
+	def test_applyReusesAmplitudes(self):
+		sweep = felix.lookdevSweep("/audio/track.wav", [3, 7], [0.4], [0.2])
+		self.fakeCmds.outputReads = 0
+		felix.lookdevSweep("/audio/track.wav", [3, 7], [0.4], [0.2], applyIndex=(1, 0, 0, 0), ampList=sweep["ampList"])
+		self.assertEqual(self.fakeCmds.outputReads, 0)
+		self.assertTrue(self.fakeCmds.keys)
+
+	def test_applyRejectsAmplitudesFromAnotherFile(self):
+		self.assertRaises(ValueError, felix.lookdevSweep, "/audio/track.wav", [7], [0.4], [0.2],
+		                  applyIndex=(0, 0, 0, 0), ampList=[0.5] * 3)
+
+if __name__ == "__main__":
+	unittest.main()